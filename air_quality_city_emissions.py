@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+A script to join the EPA air quality trends of USA cities with the CO2 emissions
+at the grid points nearest the cities for each year from 2000 to 2014.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import data
+from data.air_quality import largest_areas
+from data.air_quality import read_air_quality
+from util import custom_argparse_types as cat
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('-c', '--cities', type=cat.abs_existing_file,
+                        default=os.path.join('data', 'cities', 'CitiesandClimateChange.csv'),
+                        help='The cities dataset.')
+
+    parser.add_argument('-a', '--air-quality', type=cat.abs_existing_file,
+                        default=os.path.join('data', 'cities',
+                                             'airqualitytrendsbycity2000-2015.xlsx'),
+                        help='The air quality trends by city dataset.')
+
+    parser.add_argument('-e', '--emissions', type=data.get_emissions_grid,
+                        default='CMIP6',
+                        help='The emissions dataset.')
+
+    parser.add_argument('--start-year', type=int, default=2000,
+                        help='First year to join.')
+
+    parser.add_argument('--end-year', type=int, default=2014,
+                        help='Last year to join.')
+
+    parser.add_argument('-n', '--nearest', type=cat.unsigned_int, default=3,
+                        help='Sum the emissions for this many cells which are '
+                             'nearest neighbors to a city.')
+
+    parser.add_argument('-o', '--output',
+                        help='Save the joined air quality and emissions to this CSV file.')
+
+    data.execution.add_arguments(parser)
+
+    return parser.parse_args(args)
+
+
+def city_annual_emissions(emis, city_data: pd.DataFrame, start_year: int, end_year: int,
+                          nearest: int) -> pd.DataFrame:
+    """
+    Find the annual emissions (MtCO2) of the grid cells nearest each city
+
+    :param emis: The EmissionsGrid
+    :param city_data: A table of the cities with City, Latitude, and Longitude columns
+    :param start_year: The first year to find the emissions for
+    :param end_year: The last year to find the emissions for
+    :param nearest: Sum the emissions for this many cells nearest to each city
+    :return: A table of the emissions of each city (City) in each year (Year)
+    """
+    annual = emis.co2.sel(time=slice(str(start_year), str(end_year)))
+    annual = annual.groupby('time.year').sum(dim='time')
+
+    annual_Mt = emis.nearest_cell_emissions(annual, city_data['Latitude'].values,
+                                            city_data['Longitude'].values, nearest)
+
+    return pd.DataFrame({'City': np.tile(city_data['City'].values, len(annual.year)),
+                         'Year': np.repeat(annual.year.values, len(city_data)),
+                         'NN Emissions (MtCO2e)': annual_Mt.ravel()})
+
+
+def main(args):
+    data.execution.configure_from_args(args)
+    n_years = args.end_year - args.start_year + 1
+    emis = args.emissions.from_disk(window_months=12 * n_years)
+
+    city_data = pd.read_csv(args.cities)
+    city_data = city_data[city_data.Country == 'USA']
+
+    city_emissions = city_annual_emissions(emis, city_data, args.start_year, args.end_year,
+                                           args.nearest)
+
+    air_quality = largest_areas(read_air_quality(args.air_quality))
+    joined = air_quality.merge(city_emissions, on=['City', 'Year'])
+
+    if args.output:
+        joined.to_csv(args.output, index=False)
+
+    print(f'\nCorrelation between the {emis.name} emissions from {args.nearest} nearest '
+          f'neighbor cells and the air quality trends, {args.start_year}-{args.end_year}:\n')
+    correlation = joined.groupby(['City', 'CBSA', 'Pollutant', 'Trend Statistic']).apply(
+        lambda g: g['Value'].corr(g['NN Emissions (MtCO2e)']))
+    print(correlation.to_string(float_format='{:.3f}'.format))
+    print('')
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -8,10 +8,7 @@ emitting cities (coordinates).
 import argparse
 import os
 
-import numpy as np
 import pandas as pd
-from scipy import spatial
-from scipy.interpolate import RegularGridInterpolator
 
 import data
 from util import custom_argparse_types as cat
@@ -37,39 +34,38 @@ def parse_args(args=None):
                         help='Sum the emissions for this many cells which are '
                              'nearest neighbors to a city.')
 
-    return parser.parse_args(args)
+    parser.add_argument('-w', '--window-months', type=cat.unsigned_int, default=12,
+                        help='Also show the cities emissions profile over the year in '
+                             'windows of this many months (e.g., 3 for quarterly).')
 
+    data.execution.add_arguments(parser)
 
-def main(args):
-    emis = args.emissions.from_disk()
+    args = parser.parse_args(args)
+    if 12 % args.window_months:
+        parser.error('--window-months must evenly divide the 12 months of a year.')
 
-    emis_year_gC = emis.series_emissions(args.year, n_months=12)
-    emis_year_Mt = emis_year_gC.values * 1.0e-12
+    return args
 
-    city_data = pd.read_csv(args.cities)
 
-    if not args.nearest:
-        emis_grid_nn = RegularGridInterpolator([emis.emissions.lat.values,
-                                                emis.emissions.lon.values],
-                                               emis_year_Mt, method='nearest')
+def main(args):
+    data.execution.configure_from_args(args)
+    emis = args.emissions.from_disk(window_months=12)
 
-        city_data['NN Emissions (MtCO2e)'] = emis_grid_nn(city_data[['Latitude', 'Longitude']])
-        number_of_cells = 1
-    else:
-        emis.ll = np.ndarray((len(emis.lat_grid.ravel()), 2))
-        emis.ll[:, 0] = emis.lat_grid.ravel()
-        emis.ll[:, 1] = emis.lon_grid.ravel()
+    emis_windows_gC = emis.window_emissions(f'{args.year}-01', f'{args.year}-12',
+                                            n_months=args.window_months)
+    emis_windows_gC = emis_windows_gC.transpose('window', 'lat', 'lon').load()
 
-        emis.tree = spatial.cKDTree(emis.ll)
-        city_q_distance, city_q_idxs = emis.tree.query(city_data[['Latitude', 'Longitude']],
-                                                       k=args.nearest)
+    emis_year_Mt = emis_windows_gC.sum(dim='window').values * 1.0e-12 \
+        * data.MOLAR_MASS_CO2 / data.MOLAR_MASS_C
 
-        city_q_emissions = np.zeros(city_data[['Latitude']].shape)
-        for ii in range(len(city_data[['Latitude']])):
-            city_q_emissions[ii] = np.sum(emis_year_Mt.ravel()[city_q_idxs[ii, :]])
+    city_data = pd.read_csv(args.cities)
 
-        city_data['NN Emissions (MtCO2e)'] = city_q_emissions * data.MOLAR_MASS_CO2 / data.MOLAR_MASS_C
-        number_of_cells = args.nearest
+    number_of_cells = args.nearest if args.nearest else 1
+    city_windows_Mt = emis.nearest_cell_emissions(emis_windows_gC,
+                                                  city_data['Latitude'].values,
+                                                  city_data['Longitude'].values,
+                                                  number_of_cells)
+    city_data['NN Emissions (MtCO2e)'] = city_windows_Mt.sum(axis=0)
 
     city_data['NN Em. - City (MtCO2e)'] = city_data.iloc[:, 7] - city_data.iloc[:, 5]
     city_data['% Error'] = (city_data.iloc[:, 7]
@@ -83,7 +79,7 @@ def main(args):
           'nearest neighbor cells: {:.3f}'.format(number_of_cells, nn_emis))
 
     global_emis = emis_year_Mt.sum()
-    print('\nTotal global emissions from {} (Mt):            {:.3f}'.format(emis.name, global_emis))
+    print('\nTotal global emissions from {} (MtCO2e):        {:.3f}'.format(emis.name, global_emis))
 
     print('\n% global emissions cities account for:')
     print('    ' + 'Using [Hoornweg, 2010]:'
@@ -91,6 +87,15 @@ def main(args):
     print('    ' + 'Using {:2d} nearest neighbor cells:'
                    '    {:.3f}'.format(number_of_cells, nn_emis / global_emis * 100))
 
+    if args.window_months < 12:
+        window_months = pd.to_datetime(emis_windows_gC.window.values).strftime('%b')
+        profile = pd.DataFrame(city_windows_Mt.T, index=city_data['City'], columns=window_months)
+
+        print('\nCity emissions (MtCO2e) from {:2d} nearest neighbor cells in each '
+              '{}-month window of {}, by starting month:\n'.format(number_of_cells,
+                                                                  args.window_months, args.year))
+        print(profile.to_string(float_format='{:.3f}'.format))
+
     print('')
 
 
@@ -9,6 +9,7 @@ from data.grid import PPM_C_1752
 from data.grid import EmissionsGrid
 from data.cmip5 import CMIP5EmissionsGrid
 from data.cmip6 import CMIP6EmissionsGrid
+from data.execution import configure
 
 grid_dispatch = {'CMIP5': CMIP5EmissionsGrid,
                  'CMIP6': CMIP6EmissionsGrid}
@@ -28,4 +29,4 @@ def get_emissions_grid(dataset: str) -> Type[EmissionsGrid]:
 
 
 __all__ = [MOLAR_MASS_AIR, MEAN_MASS_AIR, MOLAR_MASS_C, MOLAR_MASS_CO2, PPM_C_1752,
-           get_emissions_grid]
+           configure, get_emissions_grid]
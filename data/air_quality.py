@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+
+import xarray as xr
+import pandas as pd
+
+from util.strings import strip_all
+
+HERE = os.path.dirname(__file__)
+AIR_QUALITY_XLSX = os.path.join(HERE, 'cities', 'airqualitytrendsbycity2000-2015.xlsx')
+
+
+def principal_city(area: str) -> str:
+    """
+    Get the (normalized) name of the principal city of a Core Based Statistical Area.
+
+    :param area: The name of the Core Based Statistical Area
+    :return: The principal city name, stripped of all white space
+
+    >>> principal_city('New York-Newark-Jersey City, NY-NJ-PA')
+    'NewYork'
+    """
+    return strip_all(area.split(',')[0].split('-')[0])
+
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _parse_air_quality(path: str) -> pd.DataFrame:
+    raw = pd.read_excel(path, header=3)
+
+    # the trailing rows are the footnotes; the area is only given in its first row
+    raw = raw.dropna(subset=['Pollutant'])
+    raw['Core Based Statistical Area'] = raw['Core Based Statistical Area'].ffill()
+
+    years = [c for c in raw.columns if str(c).isdigit()]
+    air_quality = raw.melt(id_vars=['CBSA', 'Core Based Statistical Area', 'Pollutant',
+                                    'Trend Statistic', 'Number of Trends Sites'],
+                           value_vars=years, var_name='Year', value_name='Value')
+
+    air_quality['CBSA'] = air_quality['CBSA'].astype(int)
+    air_quality['Year'] = air_quality['Year'].astype(int)
+    air_quality['Value'] = pd.to_numeric(air_quality['Value'], errors='coerce')
+    air_quality['City'] = air_quality['Core Based Statistical Area'].map(principal_city)
+
+    return air_quality
+
+
+def read_air_quality(path: str = AIR_QUALITY_XLSX, cache: str = None) -> pd.DataFrame:
+    """
+    Read the EPA air quality trends by city in a long (one value per row) format. The
+    spreadsheet is only parsed when the (netCDF) cache is missing or was made from a
+    different version of the spreadsheet.
+
+    :param path: The path to the air quality trends spreadsheet
+    :param cache: The path to the cache file (default: the spreadsheet path with a .nc extension)
+    :return: A table of the air quality trends with a normalized City column
+    """
+    if cache is None:
+        cache = os.path.splitext(path)[0] + '.nc'
+
+    source_hash = _file_hash(path)
+    if os.path.isfile(cache):
+        try:
+            with xr.open_dataset(cache) as cached:
+                if cached.attrs.get('source_hash') == source_hash:
+                    return cached.to_dataframe().reset_index(drop=True)
+        except Exception:
+            pass  # an unreadable (e.g., truncated) cache is rebuilt below
+
+    air_quality = _parse_air_quality(path)
+
+    ds = xr.Dataset.from_dataframe(air_quality)
+    ds.attrs['source'] = os.path.basename(path)
+    ds.attrs['source_hash'] = source_hash
+
+    # write to a temporary file first so an interrupted (or concurrent) run never leaves
+    # a partial cache behind
+    fd, tmp_cache = tempfile.mkstemp(suffix='.nc', dir=os.path.dirname(os.path.abspath(cache)))
+    os.close(fd)
+    try:
+        ds.to_netcdf(tmp_cache)
+        os.replace(tmp_cache, cache)
+    finally:
+        if os.path.exists(tmp_cache):
+            os.remove(tmp_cache)
+
+    return air_quality
+
+
+def largest_areas(air_quality: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep only one Core Based Statistical Area for each (normalized) City: the one with
+    the most trend sites. Different areas can share a principal city name (e.g., Miami, FL
+    and Miami, OK), which would otherwise be joined to the same city.
+
+    :param air_quality: A table of the air quality trends (e.g., from read_air_quality)
+    :return: The air quality trends of the largest area for each City
+    """
+    sites = air_quality.drop_duplicates(['CBSA', 'Pollutant', 'Trend Statistic']) \
+        .groupby(['City', 'CBSA'])['Number of Trends Sites'].sum().reset_index()
+    largest = sites.sort_values('Number of Trends Sites', ascending=False) \
+        .drop_duplicates('City')['CBSA']
+
+    return air_quality[air_quality['CBSA'].isin(largest)]
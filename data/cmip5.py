@@ -3,6 +3,7 @@ import os
 import xarray as xr
 import pandas as pd
 
+from data import execution
 from data.grid import EmissionsGrid
 
 
@@ -31,10 +32,18 @@ class CMIP5EmissionsGrid(EmissionsGrid):
         super().__init__(em_data=em_data, co2=co2, months=months, timestamp=timestamp)
 
     @classmethod
-    def from_disk(cls, glob=None, chunks=(('time_counter', 12),), **kwargs):
+    def from_disk(cls, glob=None, chunks=None, window_months=None, **kwargs):
+        """
+        Load the dataset from disk. Unless chunks are given, the chunk sizes are picked
+        from the global execution configuration and the typical query window (months).
+        """
         if glob is None:
             glob = os.path.join(HERE, 'CMIP5', 'CMIP5_gridcar_CO2_*.nc')
 
+        if chunks is None:
+            chunks = execution.CONFIG.chunks(glob, time_dim='time_counter', lat_dim='Latitude',
+                                             window_months=window_months)
+
         em_data = xr.open_mfdataset(glob, decode_times=False, chunks=dict(chunks), **kwargs)
 
         timestamp = ' '.join(em_data.time_counter.units.split(' ')[2:])
@@ -68,15 +77,16 @@ class CMIP5EmissionsGrid(EmissionsGrid):
         Get the series indexes from a sub-series specified by two of three:
         start_date, end_date, n_months.
         """
-        start = pd.Timestamp(start_date, freq='M') - 1  # set to end of prev month
+        start = pd.Timestamp(start_date, freq='M') + 0  # set to end of month
         end = pd.Timestamp(end_date, freq='M') + 0  # set to end of month
 
+        # Note: label based slices include both ends
         if start_date and end_date:
             _slice = slice(start, end)
         elif start_date and n_months:
-            _slice = slice(start, start + 12)
+            _slice = slice(start, start + (n_months - 1))
         elif end_date and n_months:
-            _slice = slice(end-12, end)
+            _slice = slice(end - (n_months - 1), end)
         else:
             raise ValueError('Must specify at least two of: start_date, end_date, n_months.')
 
@@ -5,6 +5,7 @@ import pandas as pd
 
 from data.grid import MOLAR_MASS_C
 from data.grid import MOLAR_MASS_CO2
+from data import execution
 from data.grid import EmissionsGrid
 
 HERE = os.path.dirname(__file__)
@@ -29,10 +30,17 @@ class CMIP6EmissionsGrid(EmissionsGrid):
         super().__init__(em_data=em_data, co2=co2, months=months, timestamp=timestamp)
 
     @classmethod
-    def from_disk(cls, glob=None, chunks=(('time', 12),), **kwargs):
+    def from_disk(cls, glob=None, chunks=None, window_months=None, **kwargs):
+        """
+        Load the dataset from disk. Unless chunks are given, the chunk sizes are picked
+        from the global execution configuration and the typical query window (months).
+        """
         if glob is None:
             glob = os.path.join(HERE, 'CMIP6', 'CO2-*.nc')
 
+        if chunks is None:
+            chunks = execution.CONFIG.chunks(glob, window_months=window_months)
+
         em_data = xr.open_mfdataset(glob, decode_times=False, chunks=dict(chunks), **kwargs)
 
         timestamp = ' '.join(em_data.time.units.split(' ')[2:])
@@ -52,15 +60,16 @@ class CMIP6EmissionsGrid(EmissionsGrid):
         Get the series indexes from a sub-series specified by two of three:
         start_date, end_date, n_months.
         """
-        start = pd.Timestamp(start_date, freq='M') - 1  # set to end of prev month
+        start = pd.Timestamp(start_date, freq='M') + 0  # set to end of month
         end = pd.Timestamp(end_date, freq='M') + 0  # set to end of month
 
+        # Note: label based slices include both ends
         if start_date and end_date:
             _slice = slice(start, end)
         elif start_date and n_months:
-            _slice = slice(start, start + 12)
+            _slice = slice(start, start + (n_months - 1))
         elif end_date and n_months:
-            _slice = slice(end-12, end)
+            _slice = slice(end - (n_months - 1), end)
         else:
             raise ValueError('Must specify at least two of: start_date, end_date, n_months.')
 
@@ -0,0 +1,157 @@
+import argparse
+import glob
+import math
+import os
+
+import dask
+import psutil
+import xarray as xr
+from dask.utils import parse_bytes
+
+from util import custom_argparse_types as cat
+
+SCHEDULERS = ('threads', 'processes', 'synchronous', 'distributed')
+TARGET_CHUNK_BYTES = 128 * 2**20  # ~128 MiB
+
+
+class ExecutionConfig(object):
+    """
+    Class to represent how (and with how many resources) the dask computations are executed.
+    """
+
+    def __init__(self, scheduler: str = 'threads', workers: int = None, memory_limit=None):
+        """
+        :param scheduler: The dask scheduler to use; one of: threads, processes,
+                          synchronous, or distributed (a local distributed cluster)
+        :param workers: The number of workers (default: the number of cores)
+        :param memory_limit: The total memory, in bytes or as a string like '16GB', to size
+                             the chunks for (default: the available memory); only the
+                             distributed scheduler also enforces it on its workers
+        """
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f'{scheduler} is not a valid scheduler; '
+                             f'must be one of: {", ".join(SCHEDULERS)}.')
+        self.scheduler = scheduler
+        self.workers = workers if workers else os.cpu_count()
+
+        if isinstance(memory_limit, str):
+            memory_limit = parse_bytes(memory_limit)
+        self.memory_limit = memory_limit if memory_limit else psutil.virtual_memory().available
+
+        self.client = None
+        self.cluster = None
+
+    def apply(self):
+        """
+        Set this configuration as dask's global scheduler
+        """
+        if self.scheduler == 'distributed':
+            from distributed import Client, LocalCluster
+
+            self.cluster = LocalCluster(n_workers=self.workers, threads_per_worker=1,
+                                        memory_limit=self.memory_limit // self.workers)
+            self.client = Client(self.cluster)
+        else:
+            dask.config.set(scheduler=self.scheduler, num_workers=self.workers)
+
+    def close(self):
+        """
+        Shut down the local distributed cluster (and its workers), if one was started
+        """
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        if self.cluster is not None:
+            self.cluster.close()
+            self.cluster = None
+
+    def chunks(self, path: str, time_dim: str = 'time', lat_dim: str = 'lat',
+               window_months: int = None) -> dict:
+        """
+        Pick the chunk sizes for an emissions dataset so that a query over the requested
+        window is spread across all the workers, with each chunk fitting comfortably in
+        a worker's share of the memory.
+
+        :param path: A glob of the dataset files
+        :param time_dim: The name of the time dimension
+        :param lat_dim: The name of the latitude dimension
+        :param window_months: The number of months that will typically be queried
+                              (default: the whole dataset)
+        :return: The chunk size of the time and latitude dimensions
+        """
+        files = sorted(glob.glob(path))
+        if not files:
+            raise FileNotFoundError(f'No emissions dataset files match: {path}')
+
+        with xr.open_dataset(files[0], decode_times=False) as sample:
+            month_bytes = sum(v.nbytes / sample.sizes[time_dim]
+                              for v in sample.data_vars.values() if time_dim in v.dims)
+            n_lat = sample.sizes[lat_dim]
+
+        # leave room for the intermediate copies made while reducing each chunk
+        target = min(TARGET_CHUNK_BYTES, self.memory_limit // (4 * self.workers))
+
+        n_months = max(1, int(target // month_bytes))
+        if window_months:
+            n_months = min(n_months, window_months)
+        if n_months >= 12:
+            n_months -= n_months % 12  # keep chunks aligned with years
+
+        n_time_chunks = math.ceil(window_months / n_months) if window_months else self.workers
+        n_lat_chunks = max(math.ceil(self.workers / n_time_chunks),
+                           math.ceil(n_months * month_bytes / target))
+        n_lat_chunks = min(n_lat_chunks, n_lat)
+
+        return {time_dim: n_months, lat_dim: math.ceil(n_lat / n_lat_chunks)}
+
+
+CONFIG = ExecutionConfig()
+
+
+def configure(scheduler: str = 'threads', workers: int = None,
+              memory_limit=None) -> ExecutionConfig:
+    """
+    Set the global execution configuration used for all the dask computations; any local
+    distributed cluster started by the previous configuration is shut down
+
+    :param scheduler: The dask scheduler to use; one of: threads, processes,
+                      synchronous, or distributed (a local distributed cluster)
+    :param workers: The number of workers (default: the number of cores)
+    :param memory_limit: The total memory, in bytes or as a string like '16GB', to size
+                         the chunks for (default: the available memory); only the
+                         distributed scheduler also enforces it on its workers
+    :return: The global execution configuration
+    """
+    global CONFIG
+    CONFIG.close()
+    CONFIG = ExecutionConfig(scheduler, workers, memory_limit)
+    CONFIG.apply()
+    return CONFIG
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the execution configuration options to a script's argument parser
+
+    :param parser: The argument parser
+    """
+    parser.add_argument('--scheduler', choices=SCHEDULERS, default='threads',
+                        help='The dask scheduler to use.')
+
+    parser.add_argument('--workers', type=cat.unsigned_int,
+                        help='The number of dask workers; defaults to the number of cores.')
+
+    parser.add_argument('--memory-limit',
+                        help="The total memory to size the dask chunks for (e.g., '16GB'), "
+                             "and the limit of the distributed scheduler's workers; "
+                             "defaults to the available memory.")
+
+
+def configure_from_args(args: argparse.Namespace) -> ExecutionConfig:
+    """
+    Set the global execution configuration from the options added by add_arguments
+
+    :param args: The parsed arguments
+    :return: The global execution configuration
+    """
+    return configure(args.scheduler, args.workers, args.memory_limit)
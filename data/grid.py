@@ -1,8 +1,10 @@
 import abc
+import os
 
 import numpy as np
 import xarray as xr
 import pandas as pd
+from scipy.spatial import cKDTree
 
 #########################
 # Some useful constants #
@@ -13,6 +15,21 @@ MOLAR_MASS_C = 12.01  # g/Mol
 MOLAR_MASS_CO2 = 44.01  # g/Mol
 PPM_C_1752 = 276.39  # Mol/(Mol/1e6)
 
+HERE = os.path.dirname(__file__)
+ICE_CORE_CSV = os.path.join(HERE, 'other', 'merged_ice_core_yearly.csv')
+
+
+def read_ice_core(path=ICE_CORE_CSV) -> pd.DataFrame:
+    """
+    Read the merged ice core and direct observation record of atmospheric CO2
+
+    :param path: The path to the ice core CSV file
+    :return: A table of the sample dates (fractional year CE) and CO2 concentrations (ppm)
+    """
+    # the header lines are all quoted, so treat them as comments
+    return pd.read_csv(path, comment='"', header=None, names=['Year', 'CO2 (ppm)'],
+                       skipinitialspace=True, encoding='latin-1')
+
 
 class EmissionsGrid(object):
     """
@@ -33,6 +50,8 @@ class EmissionsGrid(object):
 
         self.months = months
         self.co2 = co2
+        self._global_totals = None
+        self._tree = None
 
         self.ppm_0 = self.ppm_0 = PPM_C_1752 - self.gC_to_ppm(
                     self.series_emissions(timestamp, '1752').sum()).values
@@ -67,11 +86,133 @@ class EmissionsGrid(object):
 
         return self.co2.sel(time=_slice).sum(dim='time')
 
+    def window_emissions(self, start_date, end_date, n_months=12) -> xr.DataArray:
+        """
+        Find the total emissions at each grid location in every consecutive n-month window
+        of a timeseries, with a single grouped reduction over time
+
+        :param start_date: When to begin the first window
+        :param end_date: When to end the last window
+        :param n_months: The number of months in each window
+        :return: The emissions in each window, labeled by the end of its first month
+        """
+        _slice = self.month_slice(start_date, end_date)
+        co2 = self.co2.sel(time=_slice)
+        if not len(co2.time) or pd.Timestamp(co2.time.values[0]) != _slice.start \
+                or pd.Timestamp(co2.time.values[-1]) != _slice.stop:
+            raise ValueError(f'{start_date} to {end_date} is outside of the {self.name} dataset '
+                             f'months: {self.months[0]:%Y-%m} to {self.months[-1]:%Y-%m}.')
+        if len(co2.time) % n_months:
+            raise ValueError(f'The {len(co2.time)} months from {start_date} to {end_date} '
+                             f'cannot be split into {n_months}-month windows.')
+
+        times = co2.time.values
+        window = xr.DataArray(times[np.arange(len(times)) // n_months * n_months],
+                              coords={'time': times}, dims='time', name='window')
+
+        return co2.groupby(window).sum(dim='time')
+
+    def seasonal_emissions(self, start_year, end_year) -> xr.DataArray:
+        """
+        Find the total emissions at each grid location in every season (DJF, MAM, JJA, SON)
+        from the winter starting in the December before start_year through the autumn of
+        end_year
+
+        :param start_year: The first year to include
+        :param end_year: The last year to include
+        :return: The emissions in each season, labeled by the end of its first month
+        """
+        seasons = self.window_emissions(f'{int(start_year) - 1}-12', f'{end_year}-11',
+                                        n_months=3)
+        seasons.coords['season'] = seasons['window.season']
+        return seasons
+
+    def nearest_cell_emissions(self, emissions: xr.DataArray, latitude, longitude,
+                               nearest=None) -> np.ndarray:
+        """
+        Sum the emissions of the grid cells nearest each location (e.g., city), only
+        loading the cells which are nearest a location
+
+        :param emissions: The gridded emissions (gC) with dimensions like (window, lat, lon)
+        :param latitude: The latitude of each location
+        :param longitude: The longitude of each location
+        :param nearest: Sum the emissions for this many cells nearest each location
+                        (default: 1)
+        :return: The emissions (MtCO2) of each window (rows) at each location (columns)
+        """
+        if self._tree is None:
+            self._tree = cKDTree(np.column_stack([self.lat_grid.ravel(), self.lon_grid.ravel()]))
+
+        nearest = nearest if nearest else 1
+        _, loc_q_idxs = self._tree.query(np.column_stack([latitude, longitude]), k=nearest)
+        loc_q_idxs = np.reshape(loc_q_idxs, (len(latitude), nearest))
+
+        cells, cell_idxs = np.unique(loc_q_idxs, return_inverse=True)
+        cell_idxs = np.reshape(cell_idxs, loc_q_idxs.shape)
+
+        window_dim = [d for d in emissions.dims if d not in ('lat', 'lon')][0]
+        emissions = emissions.transpose(window_dim, 'lat', 'lon')
+        emissions_cells = emissions.stack(cell=('lat', 'lon')).isel(cell=cells).values
+
+        return emissions_cells[:, cell_idxs].sum(axis=-1) * 1.0e-12 \
+            * MOLAR_MASS_CO2 / MOLAR_MASS_C
+
+    @property
+    def global_totals(self) -> xr.DataArray:
+        """
+        The (cached) total global emissions for each month
+        """
+        if self._global_totals is None:
+            self._global_totals = self.co2.sum(dim=('lat', 'lon')).load()
+        return self._global_totals
+
+    def ppm_trajectory(self, annual=False) -> pd.Series:
+        """
+        Find the atmospheric carbon (ppm) at the end of every month (or year) from the
+        cumulative global emissions
+
+        :param annual: Whether to give the atmospheric carbon at the end of each year
+        :return: The atmospheric carbon at each month (or year) end
+        """
+        totals = self.global_totals
+        if annual:
+            totals = totals.groupby('time.year').sum(dim='time')
+
+        ppm = self.ppm_0 + self.gC_to_ppm(totals.cumsum())
+        return ppm.to_series().rename('CO2 (ppm)')
+
+    def ice_core_comparison(self, path=ICE_CORE_CSV) -> pd.DataFrame:
+        """
+        Compare the emissions based atmospheric carbon to the ice core record at each
+        ice core sample date within the emissions dataset
+
+        :param path: The path to the ice core CSV file
+        :return: A table of the ice core and emissions based atmospheric carbon (ppm) at
+                 each sample date (fractional year CE)
+        """
+        # the trajectory starts from the initial carbon at the beginning of the first month
+        first = self.months[0]
+        start_year = first.year + (first.dayofyear - first.day) / (365. + first.is_leap_year)
+        month_ends = self.months.year + self.months.dayofyear \
+            / (365. + self.months.is_leap_year)
+
+        decimal_years = np.insert(np.asarray(month_ends), 0, start_year)
+        trajectory = np.insert(self.ppm_trajectory().values, 0, self.ppm_0)
+
+        ice_core = read_ice_core(path)
+        ice_core = ice_core[(ice_core['Year'] >= decimal_years[0])
+                            & (ice_core['Year'] <= decimal_years[-1])]
+
+        emissions_ppm = np.interp(ice_core['Year'], decimal_years, trajectory)
+        return pd.DataFrame({'Ice core (ppm)': ice_core['CO2 (ppm)'].values,
+                             f'{self.name} (ppm)': emissions_ppm,
+                             }, index=pd.Index(ice_core['Year'].values, name='Year'))
+
     def probe(self, end_date='2007-12-31'):
         print('\nInitial Carbon (ppm):       {:.3f} on {}'.format(
             self.ppm_0, (self.months[0] - 1).strftime('%Y-%m-%d')))
 
-        t_em = self.series_emissions(self.months[0], end_date).sum()
+        t_em = self.global_totals.sel(time=self.month_slice(self.months[0], end_date)).sum()
         # print('\nTotal cumulative emissions (gC):   {:.3e} at {}'.format(t_em, self.months[-1]))
 
         ppm_em = self.gC_to_ppm(t_em).values
@@ -0,0 +1,139 @@
+from typing import Dict
+
+import numpy as np
+import xarray as xr
+import pandas as pd
+import shapefile
+
+from shapely.geometry import box
+from shapely.geometry import shape
+from shapely.ops import unary_union
+from shapely.prepared import prep
+
+from data.grid import EmissionsGrid
+
+
+class ZonalStatistics(object):
+    """
+    Class to calculate the total emissions within a set of regions (e.g., countries).
+
+    The regions are rasterized onto the emissions grid once, giving every (cell, region)
+    pair that overlaps a fractional weight (the fraction of the cell inside the region),
+    so that region totals can be calculated with a single weighted bincount.
+    """
+
+    def __init__(self, grid: EmissionsGrid, regions: Dict[str, object]):
+        """
+        :param grid: The EmissionsGrid to calculate region totals on
+        :param regions: A mapping of region names to shapely (multi)polygons in lon/lat
+        """
+        self.grid = grid
+        self.names = list(regions.keys())
+        self.regions = [regions[name] for name in self.names]
+
+        self._labels = None
+
+    @classmethod
+    def from_shapefile(cls, grid: EmissionsGrid, path: str, name_field: str, names=None):
+        """
+        Create the zonal statistics from the shapes in a shapefile; shapes sharing a name
+        are merged into a single region
+
+        :param grid: The EmissionsGrid to calculate region totals on
+        :param path: The path to the shapefile
+        :param name_field: The record field holding the name of each region
+        :param names: Only use the regions with these names (default: all the regions)
+        :return: A ZonalStatistics instance
+        """
+        reader = shapefile.Reader(path)
+        fields = [f[0] for f in reader.fields[1:]]
+        name_idx = fields.index(name_field)
+
+        # a region may be split across several records (e.g., islands)
+        shapes = {}
+        for record, shp in zip(reader.iterRecords(), reader.iterShapes()):
+            if names is not None and record[name_idx] not in names:
+                continue
+            shapes.setdefault(record[name_idx], []).append(shape(shp.__geo_interface__))
+
+        regions = {name: unary_union(parts) for name, parts in shapes.items()}
+        return cls(grid, regions)
+
+    @property
+    def labels(self):
+        """
+        The (cached) rasterized regions as three flat arrays: the raveled (lat, lon) index of
+        each cell, the region index the cell overlaps, and the fraction of the cell in
+        the region.
+        """
+        if self._labels is None:
+            self._labels = self._rasterize()
+        return self._labels
+
+    def _rasterize(self):
+        clat = self.grid.lat_corners[:, 0]
+        clon = self.grid.lon_corners[0, :]
+        n_lon = len(clon) - 1
+
+        cells, labels, weights = [], [], []
+        for rr, region in enumerate(self.regions):
+            prepared = prep(region)
+            min_lon, min_lat, max_lon, max_lat = region.bounds
+
+            ii_range = np.nonzero((clat[1:] > min_lat) & (clat[:-1] < max_lat))[0]
+            jj_range = np.nonzero((clon[1:] > min_lon) & (clon[:-1] < max_lon))[0]
+            for ii in ii_range:
+                for jj in jj_range:
+                    cell = box(clon[jj], clat[ii], clon[jj+1], clat[ii+1])
+                    if prepared.contains(cell):
+                        frac = 1.0
+                    elif prepared.intersects(cell):
+                        frac = region.intersection(cell).area / cell.area
+                        if frac <= 0.0:
+                            continue
+                    else:
+                        continue
+
+                    cells.append(ii * n_lon + jj)
+                    labels.append(rr)
+                    weights.append(frac)
+
+        return np.array(cells, dtype=int), np.array(labels, dtype=int), np.array(weights)
+
+    def region_totals(self, emissions: xr.DataArray) -> pd.Series:
+        """
+        Find the total emissions in each region for a single (lat, lon) emissions field
+
+        :param emissions: The gridded emissions (e.g., from EmissionsGrid.series_emissions)
+        :return: The total emissions of each region
+        """
+        cells, labels, weights = self.labels
+        flat = np.asarray(emissions.transpose('lat', 'lon')).ravel()
+        totals = np.bincount(labels, weights=flat[cells] * weights, minlength=len(self.names))
+        return pd.Series(totals, index=self.names)
+
+    def annual_totals(self, start_year=None, end_year=None) -> pd.DataFrame:
+        """
+        Find the total emissions in each region for every year in a range of years. The
+        annual emissions are only loaded for the cells which overlap a region.
+
+        :param start_year: The first year to include (default: first year of the dataset)
+        :param end_year: The last year to include (default: last year of the dataset)
+        :return: A table of the region totals (columns) for each year (index)
+        """
+        cells, labels, weights = self.labels
+        unique_cells, cell_idx = np.unique(cells, return_inverse=True)
+
+        start = None if start_year is None else str(start_year)
+        end = None if end_year is None else str(end_year)
+        co2 = self.grid.co2.sel(time=slice(start, end))
+
+        annual = co2.groupby('time.year').sum(dim='time').transpose('year', 'lat', 'lon')
+        annual_cells = annual.stack(cell=('lat', 'lon')).isel(cell=unique_cells).values
+
+        totals = np.empty((annual_cells.shape[0], len(self.names)))
+        for yy, year_cells in enumerate(annual_cells):
+            totals[yy] = np.bincount(labels, weights=year_cells[cell_idx] * weights,
+                                     minlength=len(self.names))
+
+        return pd.DataFrame(totals, index=annual.year.values, columns=self.names)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import os
-import re
 import argparse
 import warnings
 import numpy as np
@@ -21,6 +20,8 @@ from cartopy import crs as ccrs
 import data
 
 from util import custom_argparse_types as cat
+from util.strings import strip_all
+from util.strings import whitespace_camel_case
 
 warnings.filterwarnings('ignore')
 
@@ -55,34 +56,9 @@ def parse_args(args=None):
     parser.add_argument('-s', '--save', action='store_true',
                         help='Save the figure as a 600dpi EPS figure instead of show.')
 
-    return parser.parse_args(args)
-
-
-def strip_all(string: str) -> str:
-    """
-    Removes all white space around and in a string.
-
-    :param string: A string to strip
-    :return: A stripped string
-
-    >>> strip_all('New York')
-    'NewYork'
-    """
-    return string.strip().replace(' ', '')
+    data.execution.add_arguments(parser)
 
-
-def whitespace_camel_case(string: str) -> str:
-    """
-    Add white space between words indicated by CamelCase typing.
-
-    :param string: A CamelCase string to add white space to
-    :return: A white spaced string
-
-    >>> whitespace_camel_case('NewYork')
-    'New York'
-    """
-    # From: https://stackoverflow.com/a/37697078
-    return re.sub('(?!^)([A-Z][a-z]+)', r' \1', string)
+    return parser.parse_args(args)
 
 
 def city_shape_from_record(reader: shapefile.Reader, city: str) -> dict:
@@ -134,7 +110,8 @@ def nn_corner_hulls(elem_nns: np.ndarray, x_corners: np.ndarray, y_corners: np.n
 
 
 def main(args):
-    emis = args.emissions.from_disk()
+    data.execution.configure_from_args(args)
+    emis = args.emissions.from_disk(window_months=12)
 
     emis_year_gC = emis.series_emissions(args.year, n_months=12)
     emis_year_Mt = emis_year_gC.values * 1.0e-12
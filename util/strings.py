@@ -0,0 +1,30 @@
+"""A set of helper functions to normalize names (e.g., of cities)"""
+
+import re
+
+
+def strip_all(string: str) -> str:
+    """
+    Removes all white space around and in a string.
+
+    :param string: A string to strip
+    :return: A stripped string
+
+    >>> strip_all('New York')
+    'NewYork'
+    """
+    return string.strip().replace(' ', '')
+
+
+def whitespace_camel_case(string: str) -> str:
+    """
+    Add white space between words indicated by CamelCase typing.
+
+    :param string: A CamelCase string to add white space to
+    :return: A white spaced string
+
+    >>> whitespace_camel_case('NewYork')
+    'New York'
+    """
+    # From: https://stackoverflow.com/a/37697078
+    return re.sub('(?!^)([A-Z][a-z]+)', r' \1', string)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+A script to compare the reported per-country CO2 emissions with the total gridded
+emissions inside each country's borders.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+from cartopy.io import shapereader
+
+import data
+from data.zonal import ZonalStatistics
+from util import custom_argparse_types as cat
+
+# Country names in the country emissions dataset which differ from the Natural Earth names
+COUNTRY_ALIASES = {'Korea': 'South Korea',
+                   'United States': 'United States of America'}
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('-c', '--countries', type=cat.abs_existing_file,
+                        default=os.path.join('data', 'other', 'CanadaLittleDataBook.csv'),
+                        help='The country emissions dataset.')
+
+    parser.add_argument('-b', '--borders', type=cat.abs_existing_file,
+                        help='A shapefile of country borders. Defaults to the Natural Earth '
+                             '1:110m countries provided by cartopy.')
+
+    parser.add_argument('-f', '--name-field', default='NAME',
+                        help='The field in the borders shapefile holding the country names.')
+
+    parser.add_argument('-e', '--emissions', type=data.get_emissions_grid,
+                        default='CMIP6',
+                        help='The emissions dataset.')
+
+    parser.add_argument('-y', '--year', type=int, default=2014,
+                        help='Year to compare with the country emissions dataset.')
+
+    parser.add_argument('-o', '--output',
+                        help='Save the gridded country emissions (MtCO2) for every year '
+                             'to this CSV file.')
+
+    data.execution.add_arguments(parser)
+
+    return parser.parse_args(args)
+
+
+def main(args):
+    data.execution.configure_from_args(args)
+    emis = args.emissions.from_disk()
+
+    if args.year not in emis.months.year:
+        raise ValueError(f'{args.year} is outside of the {emis.name} dataset years: '
+                         f'{emis.months[0].year}-{emis.months[-1].year}.')
+
+    if args.borders is None:
+        args.borders = shapereader.natural_earth(resolution='110m', category='cultural',
+                                                 name='admin_0_countries')
+
+    country_data = pd.read_csv(args.countries)
+    country_data['Country'] = country_data['Country'].str.strip()
+    country_data['Border'] = country_data['Country'].replace(COUNTRY_ALIASES)
+
+    zones = ZonalStatistics.from_shapefile(emis, args.borders, args.name_field,
+                                           names=set(country_data['Border']))
+    missing = set(country_data['Border']).difference(zones.names)
+    if missing:
+        raise KeyError(f'Countries missing from the borders shapefile: {", ".join(missing)}')
+
+    annual_gC = zones.annual_totals()
+    annual_Mt = annual_gC[country_data['Border']] * 1.0e-12 \
+        * data.MOLAR_MASS_CO2 / data.MOLAR_MASS_C
+    annual_Mt.columns = country_data['Country']
+
+    if args.output:
+        annual_Mt.to_csv(args.output, index_label='Year')
+
+    # NOTE: Though labeled kilotonnes, the reported country emissions are in MtCO2
+    reported = country_data.set_index('Country')['CO2EmisPerCountry2017 (Kilotonnes)']
+    gridded = annual_Mt.loc[args.year]
+
+    comparison = pd.DataFrame({'Reported 2017 (MtCO2)': reported,
+                               f'{emis.name} {args.year} (MtCO2)': gridded,
+                               '% Difference': (gridded - reported) / reported * 100.})
+
+    print(f'\nCountry emissions as reported for 2017 compared to the {emis.name} '
+          f'gridded emissions for {args.year}:\n')
+    print(comparison.to_string(float_format='{:.2f}'.format))
+    print('')
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -48,11 +48,14 @@ def parse_args(args=None):
     parser.add_argument('-s', '--save', action='store_true',
                         help='Save the figure as a 600dpi EPS figure instead of show.')
 
+    data.execution.add_arguments(parser)
+
     return parser.parse_args(args)
 
 
 def main(args):
-    emis = args.emissions.from_disk()
+    data.execution.configure_from_args(args)
+    emis = args.emissions.from_disk(window_months=12)
 
     emis_year_gC = emis.series_emissions(args.year, n_months=12)
     emis_year_Mt = emis_year_gC * 1.0e-12